@@ -5,12 +5,29 @@ Enhanced HTTP server with searchable, categorized troubleshooting guide
 - AJAX-based filtering and search
 - Mobile-friendly responsive design
 """
-from http.server import SimpleHTTPRequestHandler, HTTPServer
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 import os
+import email.utils
 import html
 import re
+import string
 import urllib.parse
 import json
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
+from datetime import datetime as _dt
+from functools import lru_cache
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        """Compact JSON as UTF-8 bytes when orjson isn't available"""
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 PORT = 8000
 TEXT_FILE = "steps.txt"
@@ -18,21 +35,191 @@ TEXT_FILE = "steps.txt"
 # cache parsed sections to avoid re-reading file on every request
 SECTION_CACHE = None
 CACHE_MTIME = 0
+NO_SECTIONS_HTML = '<div class="section"><p><em>No troubleshooting steps available yet.</em></p></div>'
+# encoded (last_updated, select_html, sections_html) main-page fragments
+PAGE_FRAGMENTS = (b'', b'', NO_SECTIONS_HTML.encode('utf-8'))
+
+# guards rebuilding the caches; readers just take the current references
+CACHE_LOCK = threading.Lock()
+
+# (sections list it was built from, trigram -> set of section indexes)
+TRIGRAM_INDEX = None
+
+# one parsed section of TEXT_FILE with its request-independent output pre-built
+Section = namedtuple('Section', [
+    'name', 'slug', 'body', 'body_lower', 'summary', 'error_count',
+    'section_bytes', 'option_bytes', 'line_starts', 'lower_line_starts',
+])
+
+# patterns used on every request, compiled once at import
+BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+NEWLINE_RE = re.compile(r'\n')
+# one line of section content: optional heading/bullet marker (only when text
+# follows it) and the text, with surrounding whitespace outside the groups
+LINE_RE = re.compile(
+    r'^[^\S\n]*(?:(?:(?P<h4>### )|(?P<h3>## )|(?P<li>- ))(?=.*\S))?'
+    r'(?P<text>.*?)[^\S\n]*(?:\n|\Z)',
+    re.MULTILINE,
+)
+LI_RUN_RE = re.compile(r'(?:<li>.*</li>\n)+')
+
+def _split_sections(raw):
+    """Split raw text into (name, body) pairs at "# name" heading lines.
+
+    Text before the first heading becomes a "General" section; headings whose
+    name is blank are dropped along with their body.
+    """
+    # a leading newline lets a heading on the very first line split like the rest
+    chunks = ('\n' + raw).split('\n# ')
+    segments = [[None, [chunks[0]]]]
+    for chunk in chunks[1:]:
+        name = chunk.partition('\n')[0]
+        if not name:
+            # "# " with nothing after it is not a heading; keep it as text
+            segments[-1][1].append('\n# ' + chunk)
+            continue
+        # the newline ending the previous segment was eaten by the split
+        segments[-1][1].append('\n')
+        segments.append([name, [chunk[len(name):]]])
+
+    parsed = []
+    preamble = ''.join(segments[0][1])
+    # drop the newline added above (the split may already have consumed it)
+    preamble = preamble[1:] if preamble.startswith('\n') else preamble
+    if preamble.strip():
+        parsed.append(("General", preamble))
+    for name, pieces in segments[1:]:
+        name = name.strip()
+        if name:
+            parsed.append((name, ''.join(pieces)))
+    return parsed
+
+def _error_count(body):
+    """Count top-level "- **" bullet lines; every "- **Error**:" entry is one of them."""
+    return body.count('\n- **') + (1 if body.startswith('- **') else 0)
+
+def _first(query, key):
+    """First non-blank value of key in a raw query string, or ''."""
+    if query:
+        for k, v in urllib.parse.parse_qsl(query):
+            if k == key:
+                return v
+    return ''
+
+def _etag(mtime):
+    """Strong ETag for content that changes only with its file's mtime."""
+    return f'"{mtime:.6f}"'
+
+def _render_line(m):
+    """LINE_RE replacer: one line of content to its HTML fragment plus newline."""
+    text = m.group('text')
+    if not text:
+        return ''
+    if m.group('h4'):
+        return f'<h4>{html.escape(text)}</h4>\n'
+    if m.group('h3'):
+        return f'<h3>{html.escape(text)}</h3>\n'
+    txt = BOLD_RE.sub(r'<strong>\1</strong>', html.escape(text))
+    if m.group('li'):
+        return f'<li>{txt}</li>\n'
+    return f'<p>{txt}</p>\n'
+
+def _highlight_term(text, term, text_lower=None):
+    """Wrap each occurrence of the lowercased term in <mark>, keeping the original case."""
+    if text_lower is None:
+        text_lower = text.lower()
+    if len(text_lower) != len(text):
+        # lowercasing changed the offsets (rare non-ASCII case); leave unmarked
+        return text
+    n = len(term)
+    parts = []
+    start = 0
+    i = text_lower.find(term)
+    while i >= 0:
+        parts.append(text[start:i])
+        parts.append('<mark>' + text[i:i+n] + '</mark>')
+        start = i + n
+        i = text_lower.find(term, start)
+    parts.append(text[start:])
+    return ''.join(parts)
+
+def _search_candidates(sections, term):
+    """Indexes of sections that may contain term, or None to scan them all."""
+    cached = TRIGRAM_INDEX
+    if len(term) < 3 or cached is None or cached[0] is not sections:
+        return None
+    index = cached[1]
+    grams = sorted((index.get(term[i:i+3], set()) for i in range(len(term) - 2)), key=len)
+    return set.intersection(*grams)
+
+def _search_results(sections, search_term):
+    """Encoded JSON search response for the lowercased, stripped search_term."""
+    results = []
+    if search_term:
+        candidates = _search_candidates(sections, search_term)
+        indexes = sorted(candidates) if candidates is not None else range(len(sections))
+    else:
+        indexes = range(len(sections))
+
+    for idx in indexes:
+        sec = sections[idx]
+        # snippet: first matching line plus maybe context; the one find() is
+        # both the containment check and the snippet's position
+        snippet = ""
+        if search_term:
+            hit = sec.body_lower.find(search_term)
+            if hit < 0:
+                continue
+            li = bisect_right(sec.lower_line_starts, hit) - 1
+            start = sec.line_starts[li]
+            end = sec.line_starts[li+1] - 1 if li + 1 < len(sec.line_starts) else len(sec.body)
+            line = sec.body[start:end]
+            snippet = line.strip()
+            snippet_lower = None
+            if sec.lower_line_starts is sec.line_starts:
+                # same offsets in both bodies: slice the cached lowercase line
+                lead = len(line) - len(line.lstrip())
+                snippet_lower = sec.body_lower[start+lead:start+lead+len(snippet)]
+            # add simple highlight for API consumers
+            snippet = _highlight_term(snippet, search_term, snippet_lower)
+
+        results.append({
+            'app': sec.name,
+            'slug': sec.slug,
+            'summary': sec.summary,
+            'snippet': snippet,
+            'errors': sec.error_count,
+            'matched': bool(search_term)
+        })
+
+    return _dumps({"results": results, "count": len(results), "query": search_term})
+
+@lru_cache(maxsize=256)
+def _search_bytes(mtime, search_term):
+    """_search_results over the cached sections, memoized per file version and query.
+
+    SECTION_CACHE is assigned before CACHE_MTIME, so a caller that read
+    CACHE_MTIME sees sections at least as new as that mtime.
+    """
+    return _search_results(SECTION_CACHE or [], search_term)
 
 class TroubleshootHandler(SimpleHTTPRequestHandler):
+    # responses go out in several writes; don't let Nagle hold back the last one
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):
         """Suppress default logging"""
         pass
 
     def do_GET(self):
-        from urllib.parse import urlparse, parse_qs
+        from urllib.parse import urlparse
         parsed_url = urlparse(self.path)
         path = parsed_url.path
-        query_params = parse_qs(parsed_url.query)
+        query = parsed_url.query
         
         # API endpoint for search
         if path == "/api/search":
-            self.handle_search_api(query_params)
+            self.handle_search_api(query)
             return
         
         # Editor interface
@@ -42,7 +229,7 @@ class TroubleshootHandler(SimpleHTTPRequestHandler):
         
         # Main page
         if path in ("/", "/index.html"):
-            self.send_main_page(query_params)
+            self.send_main_page(query)
             return
         
         # CSS
@@ -53,207 +240,308 @@ class TroubleshootHandler(SimpleHTTPRequestHandler):
         # Default
         super().do_GET()
 
-    def load_sections(self):
-        """Read and parse TEXT_FILE, caching the result until the file changes."""
-        global SECTION_CACHE, CACHE_MTIME
+    def load_parsed(self):
+        """Read and parse TEXT_FILE into Section records, caching until the file changes."""
+        global SECTION_CACHE, CACHE_MTIME, TRIGRAM_INDEX, PAGE_FRAGMENTS
         try:
             mtime = os.path.getmtime(TEXT_FILE)
         except OSError:
+            with CACHE_LOCK:
+                SECTION_CACHE = None
+                PAGE_FRAGMENTS = self.page_fragments([], '')
             return []
 
-        if SECTION_CACHE is None or mtime != CACHE_MTIME:
-            SECTION_CACHE = []
-            CACHE_MTIME = mtime
-            with open(TEXT_FILE, "r", encoding="utf-8") as f:
-                raw = f.read()
-            parts = re.split(r'(?m)^# (.+)$', raw)
-            if parts[0].strip():
-                SECTION_CACHE.append(("General", parts[0]))
-            for i in range(1, len(parts), 2):
-                name = parts[i].strip() if i < len(parts) else ""
-                body = parts[i+1] if i+1 < len(parts) else ""
-                if name:
-                    SECTION_CACHE.append((name, body))
-        return SECTION_CACHE
-
-    def handle_search_api(self, query_params):
-        """API endpoint for AJAX search returning snippets."""
-        search_term = query_params.get('q', [''])[0].lower().strip()
-        sections = self.load_sections()
-        results = []
-
-        for idx, (app_name, content) in enumerate(sections):
-            if search_term and search_term not in content.lower():
-                continue
-
-            # snippet: first matching line plus maybe context
-            snippet = ""
-            if search_term:
-                for line in content.split('\n'):
-                    if search_term in line.lower():
-                        snippet = line.strip()
-                        # add simple highlight for API consumers
-                        try:
-                            regex = re.compile(re.escape(search_term), re.IGNORECASE)
-                            snippet = regex.sub(r'<mark>\g<0></mark>', snippet)
-                        except re.error:
-                            pass
-                        break
-            
-            # Create summary (first few non-heading lines)
-            lines = content.split('\n')
-            summary_lines = [l.strip() for l in lines[:5] if l.strip() and not l.startswith('#')]
-            summary = ' '.join(summary_lines)[:100]
-
-            # Count errors
-            error_count = len(re.findall(r'- \*\*Error\*\*:|^- \*\*', content, re.MULTILINE))
+        sections = SECTION_CACHE
+        if sections is not None and mtime == CACHE_MTIME:
+            return sections
+
+        with CACHE_LOCK:
+            # another thread may have rebuilt the cache while we waited
+            if SECTION_CACHE is None or mtime != CACHE_MTIME:
+                with open(TEXT_FILE, "r", encoding="utf-8") as f:
+                    raw = f.read()
+                parsed = _split_sections(raw)
+                SECTION_CACHE = [self.build_section(idx, name, body)
+                                 for idx, (name, body) in enumerate(parsed)]
+                TRIGRAM_INDEX = (SECTION_CACHE, self.build_trigram_index(SECTION_CACHE))
+                PAGE_FRAGMENTS = self.page_fragments(SECTION_CACHE, self.last_updated_html(mtime))
+                CACHE_MTIME = mtime
+            return SECTION_CACHE
+
+    def append_section(self, app_name, app_steps):
+        """Append a section to TEXT_FILE, updating the cache in place when it is current."""
+        global SECTION_CACHE, CACHE_MTIME, TRIGRAM_INDEX, PAGE_FRAGMENTS
+        with CACHE_LOCK:
+            try:
+                mtime_before = os.path.getmtime(TEXT_FILE)
+            except OSError:
+                mtime_before = None
+            with open(TEXT_FILE, 'a', encoding='utf-8') as f:
+                f.write(f"\n\n# {app_name}\n\n{app_steps}\n")
+
+            # reading the file back translates newlines; mirror that here
+            steps = app_steps.replace('\r\n', '\n').replace('\r', '\n')
+            sections = SECTION_CACHE
+            if (sections is None or mtime_before != CACHE_MTIME
+                    or '\n' in app_name or '\r' in app_name
+                    or steps.startswith('# ') or '\n# ' in steps):
+                # cache is stale or the text adds more than one heading:
+                # leave it to load_parsed() to re-read the whole file
+                return
+            mtime = os.path.getmtime(TEXT_FILE)
 
-            results.append({
-                'app': app_name,
-                'slug': f'app{idx}',
-                'summary': summary,
-                'snippet': snippet,
-                'errors': error_count,
-                'matched': bool(search_term)
-            })
+            # the new heading's leading blank lines end up in the previous body
+            new_sections = list(sections)
+            if sections:
+                prev = sections[-1]
+                new_sections[-1] = self.build_section(len(sections) - 1, prev.name, prev.body + '\n\n')
+            new_sections.append(self.build_section(len(sections), app_name, f"\n\n{steps}\n"))
+
+            cached = TRIGRAM_INDEX
+            if cached is not None and cached[0] is sections:
+                # copy-on-write so readers of the old index are unaffected
+                index = dict(cached[1])
+                for idx in range(max(len(sections) - 1, 0), len(new_sections)):
+                    for gram in self.section_trigrams(new_sections[idx]):
+                        index[gram] = index.get(gram, set()) | {idx}
+            else:
+                index = self.build_trigram_index(new_sections)
+
+            SECTION_CACHE = new_sections
+            TRIGRAM_INDEX = (new_sections, index)
+            PAGE_FRAGMENTS = self.page_fragments(new_sections, self.last_updated_html(mtime))
+            CACHE_MTIME = mtime
 
-        self.send_json_response({"results": results, "count": len(results), "query": search_term})
+    def last_updated_html(self, mtime):
+        """The "Last updated" stamp shown above the sections"""
+        return '<em>Last updated: ' + html.escape(
+            _dt.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+        ) + '</em>'
+
+    def build_section(self, idx, name, body):
+        """Pre-render everything the request handlers need for one section."""
+        slug = f"app{idx}"
+        escaped_name = html.escape(name)
+
+        # Create summary (first few non-heading lines)
+        lines = body.split('\n')
+        summary_lines = [l.strip() for l in lines[:5] if l.strip() and not l.startswith('#')]
+        summary = ' '.join(summary_lines)[:100]
+
+        # Count errors
+        error_count = _error_count(body)
+
+        badge = f'<span class="error-badge">{error_count}</span>' if error_count > 0 else '<span class="info-badge">ℹ</span>'
+        buf = bytearray(f'<div class="section" data-app="{slug}"><h2>{escaped_name} {badge}</h2>'.encode('utf-8'))
+        buf += self.format_content_bytes(body)
+        buf += b'</div>'
+        section_bytes = bytes(buf)
+        option_bytes = f'<option value="{slug}">{escaped_name}</option>'.encode('utf-8')
+
+        # line start offsets, so search can slice out one line instead of splitting
+        body_lower = body.lower()
+        line_starts = self.line_offsets(body)
+        if len(body_lower) == len(body):
+            lower_line_starts = line_starts
+        else:
+            # lowercasing some non-ASCII characters changes the string length
+            lower_line_starts = self.line_offsets(body_lower)
+        return Section(name, slug, body, body_lower, summary, error_count,
+                       section_bytes, option_bytes, line_starts, lower_line_starts)
+
+    def line_offsets(self, text):
+        """Offsets of the first character of every line in text"""
+        offsets = array('i', [0])
+        offsets.extend(m.end() for m in NEWLINE_RE.finditer(text))
+        return offsets
+
+    def build_trigram_index(self, sections):
+        """Map every 3-character substring of the lowercased bodies to its sections"""
+        index = defaultdict(set)
+        for idx, sec in enumerate(sections):
+            for gram in self.section_trigrams(sec):
+                index[gram].add(idx)
+        return dict(index)
+
+    def section_trigrams(self, sec):
+        """Distinct 3-character substrings of a section's lowercased body"""
+        body_lower = sec.body_lower
+        return {body_lower[i:i+3] for i in range(len(body_lower) - 2)}
+
+    def handle_search_api(self, query):
+        """API endpoint for AJAX search returning snippets."""
+        search_term = _first(query, 'q').lower().strip()
+        if self.load_parsed():
+            body = _search_bytes(CACHE_MTIME, search_term)
+        else:
+            body = _search_results([], search_term)
+        self.send_bytes(body, "application/json; charset=utf-8")
 
     def send_json_response(self, data):
         """Send JSON response"""
+        self.send_bytes(_dumps(data), "application/json; charset=utf-8")
+
+    def send_bytes(self, body, content_type, etag=None):
+        """Send a complete 200 response from an already-encoded body"""
         self.send_response(200)
-        self.send_header("Content-type", "application/json; charset=utf-8")
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
+
+    def send_validators(self, etag, mtime):
+        """Send the ETag and Last-Modified headers for a cacheable response"""
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(mtime))
+
+    def not_modified(self, etag, mtime=None):
+        """Answer 304 and return True if the client's cached copy is still current"""
+        if_none_match = self.headers.get('If-None-Match')
+        if_modified_since = self.headers.get('If-Modified-Since')
+        fresh = False
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            fresh = '*' in tags or etag in tags
+        elif if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, IndexError, OverflowError, ValueError):
+                pass
+            else:
+                fresh = since.tzinfo is not None and int(mtime) <= since.timestamp()
+        if fresh:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+        return fresh
 
     def send_editor_page(self):
         """Send the editor interface"""
-        self.send_response(200)
-        self.send_header("Content-type", "text/html; charset=utf-8")
-        self.end_headers()
+        self.send_bytes(EDITOR_PAGE_BYTES, "text/html; charset=utf-8")
 
-        # build editor HTML using plain string to simplify curly-brace handling
-        editor_page = """<!doctype html>
-<html>
-<head>
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width, initial-scale=1">
-<title>Troubleshooting Editor</title>
-<link rel="stylesheet" href="/style.css">
-<style>
-.editor-container { max-width: 900px; margin: 0 auto; padding: 1em; }
-.editor-form { background: white; padding: 1.5em; border-radius: 8px; margin-bottom: 2em; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
-.form-group { margin: 1.2em 0; }
-label { display: block; font-weight: 600; margin-bottom: 0.5em; color: #333; }
-input[type="text"], textarea, select { 
-    width: 100%; padding: 0.75em; border: 1px solid #ddd; 
-    border-radius: 4px; font-family: monospace; font-size: 1em;
-    box-sizing: border-box;
-}
-input:focus, textarea:focus { outline: none; border-color: #0066cc; box-shadow: 0 0 0 3px rgba(0,102,204,0.1); }
-textarea { min-height: 200px; white-space: pre; }
-button { 
-    background: #0066cc; color: white; padding: 0.8em 1.5em; 
-    border: none; border-radius: 4px; cursor: pointer; font-size: 1em; font-weight: 600;
-}
-button:hover { background: #0052a3; }
-button:active { transform: scale(0.98); }
-.editor-section h2 { color: #333; margin-top: 2em; margin-bottom: 1em; }
-</style>
-</head>
-<body>
-<div class="editor-container">
-    <header class="header">
-        <h1>📝 Troubleshooting Editor</h1>
-    </header>
-    
-    <p><a href="/">← Back to troubleshooting guide</a></p>
-    
-    <div class="editor-form">
-        <h2>Add New Application Section</h2>
-        <form method="post" action="/editor">
-            <div class="form-group">
-                <label for="appName">Application Name:</label>
-                <input type="text" id="appName" name="appName" placeholder="e.g. HP Printer Errors" required>
-            </div>
-            
-            <div class="form-group">
-                <label for="appSteps">Content:</label>
-                <textarea id="appSteps" name="appSteps" placeholder="## Category Name&#10;- **Error Code**: Description and solution" required></textarea>
-            </div>
-            
-            <button type="submit">Add Application</button>
-        </form>
-    </div>
-    
-    <div class="editor-section">
-        <h2>Edit Full Content</h2>
-        <form method="post" action="/editor">
-            <div class="form-group">
-                <textarea id="fullContent" name="fullContent"></textarea>
-            </div>
-            <button type="submit" name="action" value="save_full">Save Full Content</button>
-        </form>
-    </div>
-</div>
-
-<script>
-fetch('{TEXT_FILE}')
-    .then(r => r.text())
-    .then(text => {
-        document.getElementById('fullContent').value = text;
-    })
-    .catch(err => console.log('Could not load file'));
-</script>
-</body>
-</html>"""
-        # substitute placeholder for actual path
-        editor_page = editor_page.replace("{TEXT_FILE}", TEXT_FILE)
-        self.wfile.write(editor_page.encode("utf-8"))
-
-    def send_main_page(self, query_params):
+    def send_main_page(self, query):
         """Send the main troubleshooting page with simple sections"""
+        has_sections = bool(self.load_parsed())
+        # read the mtime first: PAGE_FRAGMENTS is replaced before CACHE_MTIME, so
+        # the fragments are never older than the ETag sent with them
+        mtime = CACHE_MTIME
+        last_updated, select_html, sections_html = PAGE_FRAGMENTS
+
+        success_msg = b''
+        etag = None
+        msg_text = _first(query, 'msg')
+        if msg_text:
+            success_msg = f'<div class="alert alert-success" role="alert">✓ {html.escape(msg_text)}</div>'.encode('utf-8')
+        elif has_sections:
+            etag = _etag(mtime)
+            if self.not_modified(etag, mtime):
+                return
+
+        # write the page as head / cached sections / tail instead of one joined copy
+        head = b''.join((PAGE_HEAD_BYTES, last_updated, PAGE_ALERT_BYTES, success_msg,
+                         PAGE_SELECT_BYTES, select_html, PAGE_MIDDLE_BYTES))
         self.send_response(200)
         self.send_header("Content-type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(head) + len(sections_html) + len(PAGE_TAIL_BYTES)))
+        if etag:
+            self.send_validators(etag, mtime)
         self.end_headers()
+        self.wfile.write(head)
+        self.wfile.write(sections_html)
+        self.wfile.write(PAGE_TAIL_BYTES)
+
+    def page_fragments(self, sections, last_updated):
+        """Encoded (last_updated, select_html, sections_html) fragments for sections"""
+        if not sections:
+            return last_updated.encode('utf-8'), b'', NO_SECTIONS_HTML.encode('utf-8')
+        options = [b'<option value="__all__">All applications</option>']
+        options.extend(sec.option_bytes for sec in sections)
+        select_html = b'<select id="appSelect" onchange="filterApp()">' + b"\n".join(options) + b'</select>'
+        sections_html = b"\n".join(sec.section_bytes for sec in sections)
+        return last_updated.encode('utf-8'), select_html, sections_html
+
+    def format_content_bytes(self, content):
+        """Format content as UTF-8 HTML, rendering headings, bullets and bold text."""
+        out = LINE_RE.sub(_render_line, content)
+        # wrap each run of consecutive list items (blank lines don't break a run)
+        out = LI_RUN_RE.sub(lambda m: '<ul>\n' + m.group(0) + '</ul>\n', out)
+        return out.rstrip('\n').encode('utf-8')
+
+    def send_css(self):
+        """Send CSS file or inline default"""
+        if os.path.exists('style.css'):
+            with open('style.css', 'rb') as f:
+                st = os.fstat(f.fileno())
+                etag = _etag(st.st_mtime)
+                if self.not_modified(etag, st.st_mtime):
+                    return
+                self.send_response(200)
+                self.send_header('Content-type', 'text/css; charset=utf-8')
+                self.send_header('Content-Length', str(st.st_size))
+                self.send_validators(etag, st.st_mtime)
+                self.end_headers()
+                self.copyfile(f, self.wfile)
+        else:
+            if self.not_modified(DEFAULT_CSS_ETAG):
+                return
+            self.send_bytes(DEFAULT_CSS_BYTES, 'text/css; charset=utf-8', DEFAULT_CSS_ETAG)
+
+    def copyfile(self, source, outputfile):
+        """Copy a file to the client, zero-copy via sendfile where the platform has it"""
+        if outputfile is self.wfile:
+            # socket.sendfile loops over os.sendfile and falls back to send()
+            self.wfile.flush()
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
 
-        success_msg = ""
-        if 'msg' in query_params:
-            msg_text = query_params['msg'][0] if query_params['msg'] else ""
-            success_msg = f'<div class="alert alert-success" role="alert">✓ {html.escape(msg_text)}</div>'
+    def get_default_css(self):
+        """Default mobile-first CSS"""
+        return _DEFAULT_CSS
 
-        app_sections = self.load_sections()
-        last_updated = ''
-        if os.path.exists(TEXT_FILE):
+    def do_POST(self):
+        """Handle POST requests"""
+        from urllib.parse import urlparse
+        parsed_url = urlparse(self.path)
+        path = parsed_url.path
+        
+        if path == "/editor":
             try:
-                mtime = os.path.getmtime(TEXT_FILE)
-                last_updated = '<em>Last updated: ' + html.escape(
-                    __import__('datetime').datetime.fromtimestamp(mtime)
-                    .strftime('%Y-%m-%d %H:%M:%S')
-                ) + '</em>'
-            except Exception:
-                last_updated = ''
-        if app_sections:
-
-            # Build plain sections
-            options = ['<option value="__all__">All applications</option>']
-            section_html_list = []
-            
-            for idx, (name, body) in enumerate(app_sections):
-                slug = f"app{idx}"
-                options.append(f'<option value="{slug}">{html.escape(name)}</option>')
-                formatted = self.format_content(body)
-                error_count = len(re.findall(r'- \*\*Error\*\*:|^- \*\*', body, re.MULTILINE))
-                badge = f'<span class="error-badge">{error_count}</span>' if error_count > 0 else '<span class="info-badge">ℹ</span>'
-                section_html_list.append(f'<div class="section" data-app="{slug}"><h2>{html.escape(name)} {badge}</h2>{formatted}</div>')
-            
-            sections_html = "\n".join(section_html_list)
-            select_html = '<select id="appSelect" onchange="filterApp()">' + "\n".join(options) + '</select>'
+                content_length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(content_length).decode('utf-8')
+                params = urllib.parse.parse_qs(body)
+                
+                if 'action' in params and params['action'][0] == 'save_full':
+                    full_content = params.get('fullContent', [''])[0]
+                    with open(TEXT_FILE, 'w', encoding='utf-8') as f:
+                        f.write(full_content)
+                    redirect_url = "/?msg=Content saved successfully"
+                else:
+                    app_name = params.get('appName', [''])[0].strip()
+                    app_steps = params.get('appSteps', [''])[0].strip()
+                    
+                    if app_name:
+                        self.append_section(app_name, app_steps)
+                        redirect_url = f"/?msg=Added: {urllib.parse.quote(app_name)}"
+                    else:
+                        redirect_url = "/?msg=Application name required"
+                
+                self.send_response(303)
+                self.send_header('Location', redirect_url)
+                self.end_headers()
+            except Exception as e:
+                self.send_response(500)
+                self.send_header("Content-type", "text/plain")
+                self.end_headers()
+                self.wfile.write(f"Error: {str(e)}".encode('utf-8'))
         else:
-            select_html = ''
-            sections_html = '<div class="section"><p><em>No troubleshooting steps available yet.</em></p></div>'
+            self.send_error(405)
 
-        page = """<!doctype html>
+# page templates, parsed once at import; literal braces are doubled for str.format
+MAIN_TEMPLATE = """<!doctype html>
 <html>
 <head>
 <meta charset="utf-8">
@@ -302,147 +590,147 @@ const searchBox = document.getElementById('searchBox');
 let searchTimeout;
 
 // utility to escape regex
-function escapeRegex(s) {
-    return s.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\$&');
-}
+function escapeRegex(s) {{
+    return s.replace(/[.*+?^${{}}()|[\\]\\\\]/g, '\\$&');
+}}
 
 // highlight occurrences of term inside element
-function highlightTerm(el, term) {
+function highlightTerm(el, term) {{
     if (!term) return;
-    const regex = new RegExp(`(${escapeRegex(term)})`, 'gi');
+    const regex = new RegExp(`(${{escapeRegex(term)}})`, 'gi');
     el.innerHTML = el.innerHTML.replace(/<mark>(.*?)<\/mark>/gi, '$1'); // remove previous highlights
     el.innerHTML = el.innerHTML.replace(regex, '<mark>$1</mark>');
-}
+}}
 
 // keep original HTML so we can restore or filter individual sections
-document.addEventListener('DOMContentLoaded', () => {
-    document.querySelectorAll('.section').forEach(sec => {
+document.addEventListener('DOMContentLoaded', () => {{
+    document.querySelectorAll('.section').forEach(sec => {{
         sec.dataset.original = sec.innerHTML;
-    });
+    }});
     // attach collapse behaviour to headers
-    document.querySelectorAll('.section h2').forEach(h2 => {
-        h2.addEventListener('click', () => {
+    document.querySelectorAll('.section h2').forEach(h2 => {{
+        h2.addEventListener('click', () => {{
             h2.closest('.section').classList.toggle('collapsed');
-        });
-    });
+        }});
+    }});
     // collapse/expand all buttons
-    document.getElementById('collapseAll').addEventListener('click', () => {
+    document.getElementById('collapseAll').addEventListener('click', () => {{
         document.querySelectorAll('.section').forEach(sec => sec.classList.add('collapsed'));
-    });
-    document.getElementById('expandAll').addEventListener('click', () => {
+    }});
+    document.getElementById('expandAll').addEventListener('click', () => {{
         document.querySelectorAll('.section').forEach(sec => sec.classList.remove('collapsed'));
-    });
+    }});
     // dark mode toggle
     const dm = document.getElementById('darkModeToggle');
-    dm.addEventListener('click', () => {
+    dm.addEventListener('click', () => {{
         document.body.classList.toggle('dark-mode');
         localStorage.setItem('darkMode', document.body.classList.contains('dark-mode'));
-    });
-    if (localStorage.getItem('darkMode') === 'true') {
+    }});
+    if (localStorage.getItem('darkMode') === 'true') {{
         document.body.classList.add('dark-mode');
-    }
+    }}
     // back-to-top
     const topBtn = document.createElement('button');
     topBtn.id = 'backToTop';
     topBtn.className = 'back-to-top';
     topBtn.textContent = '↑ Top';
-    topBtn.addEventListener('click', () => window.scrollTo({ top: 0, behavior: 'smooth' }));
+    topBtn.addEventListener('click', () => window.scrollTo({{ top: 0, behavior: 'smooth' }}));
     document.body.appendChild(topBtn);
-    window.addEventListener('scroll', () => {
+    window.addEventListener('scroll', () => {{
         if (window.pageYOffset > 200) topBtn.classList.add('show');
         else topBtn.classList.remove('show');
-    });
-});
+    }});
+}});
 
-function performSearch() {
+function performSearch() {{
     clearTimeout(searchTimeout);
     const term = searchBox.value.trim().toLowerCase();
     const sections = document.querySelectorAll('.section');
     let visibleCount = 0;
 
-    if (term.length < 1) {
-        sections.forEach(section => {
+    if (term.length < 1) {{
+        sections.forEach(section => {{
             section.innerHTML = section.dataset.original;
             section.style.display = '';
             visibleCount++;
-        });
+        }});
         document.getElementById('searchResults').style.display = 'none';
         return;
-    }
+    }}
 
     // ask server for a list of matching apps/snippets and show clickable suggestions
-    if (term.length > 1) {
-        fetch(`/api/search?q=${encodeURIComponent(term)}`)
+    if (term.length > 1) {{
+        fetch(`/api/search?q=${{encodeURIComponent(term)}}`)
             .then(r => r.json())
-            .then(data => {
+            .then(data => {{
                 const resDiv = document.getElementById('searchResults');
-                if (data.count > 0) {
-                    resDiv.innerHTML = data.results.map(r => {
+                if (data.count > 0) {{
+                    resDiv.innerHTML = data.results.map(r => {{
                         const txt = r.snippet || r.summary;
-                        return `<div class="search-item" data-slug="${r.slug}"><strong>${r.app}</strong>: ${txt}</div>`;
-                    }).join('');
+                        return `<div class="search-item" data-slug="${{r.slug}}"><strong>${{r.app}}</strong>: ${{txt}}</div>`;
+                    }}).join('');
                     resDiv.style.display = 'block';
-                    resDiv.querySelectorAll('.search-item').forEach(item => {
-                        item.addEventListener('click', () => {
-                            const target = document.querySelector(`.section[data-app="${item.dataset.slug}"]`);
-                            if (target) {
-                                target.scrollIntoView({behavior: 'smooth'});
+                    resDiv.querySelectorAll('.search-item').forEach(item => {{
+                        item.addEventListener('click', () => {{
+                            const target = document.querySelector(`.section[data-app="${{item.dataset.slug}}"]`);
+                            if (target) {{
+                                target.scrollIntoView({{behavior: 'smooth'}});
                                 target.classList.add('highlight');
                                 setTimeout(() => target.classList.remove('highlight'), 2000);
-                            }
+                            }}
                             resDiv.style.display = 'none';
-                        });
-                    });
-                } else {
+                        }});
+                    }});
+                }} else {{
                     resDiv.innerHTML = '<div class="search-header">No matches found</div>';
                     resDiv.style.display = 'block';
-                }
-            });
-    }
+                }}
+            }});
+    }}
 
-    searchTimeout = setTimeout(() => {
-        sections.forEach(section => {
+    searchTimeout = setTimeout(() => {{
+        sections.forEach(section => {{
             // restore original HTML for fresh filtering
             section.innerHTML = section.dataset.original;
             const title = section.querySelector('h2')?.textContent?.toLowerCase() || '';
             let matched = false;
 
-            if (title.includes(term)) {
+            if (title.includes(term)) {{
                 matched = true;
-            }
+            }}
 
             // narrow down individual elements (headings, paragraphs, list items)
-            section.querySelectorAll('h3, h4, p, li').forEach(el => {
-                if (!el.textContent.toLowerCase().includes(term)) {
+            section.querySelectorAll('h3, h4, p, li').forEach(el => {{
+                if (!el.textContent.toLowerCase().includes(term)) {{
                     el.remove();
-                } else {
+                }} else {{
                     matched = true;
-                }
-            });
+                }}
+            }});
             // clean up any empty lists after removing items
-            section.querySelectorAll('ul').forEach(ul => {
-                if (ul.querySelectorAll('li').length === 0) {
+            section.querySelectorAll('ul').forEach(ul => {{
+                if (ul.querySelectorAll('li').length === 0) {{
                     ul.remove();
-                }
-            });
+                }}
+            }});
 
-            if (matched) {
+            if (matched) {{
                 section.style.display = '';
                 visibleCount++;
                 highlightTerm(section, term);
-            } else {
+            }} else {{
                 section.style.display = 'none';
-            }
-        });
+            }}
+        }});
 
-        if (visibleCount === 0) {
+        if (visibleCount === 0) {{
             document.getElementById('searchResults').innerHTML = '<div class="search-header">No matches found</div>';
             document.getElementById('searchResults').style.display = 'block';
-        } else {
+        }} else {{
             document.getElementById('searchResults').style.display = 'none';
-        }
-    }, 200);
-}
+        }}
+    }}, 200);
+}}
 
 function filterApp() {{
     const val = document.getElementById('appSelect').value;
@@ -467,70 +755,84 @@ document.addEventListener('keydown', (e) => {{
 </script>
 </body>
 </html>"""
-        # insert dynamic content into placeholders
-        page = page.replace("{success_msg}", success_msg)
-        page = page.replace("{select_html}", select_html)
-        page = page.replace("{sections_html}", sections_html)
-        page = page.replace("{last_updated}", last_updated)
-        self.wfile.write(page.encode("utf-8"))
-
-
-    def format_content(self, content):
-        """Format content with HTML structure, rendering bullets and bold text."""
-        lines = content.split('\n')
-        html_parts = []
-        list_open = False
-
-        def close_list():
-            nonlocal list_open
-            if list_open:
-                html_parts.append('</ul>')
-                list_open = False
-
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('### '):
-                close_list()
-                html_parts.append(f'<h4>{html.escape(stripped[4:])}</h4>')
-            elif stripped.startswith('## '):
-                close_list()
-                html_parts.append(f'<h3>{html.escape(stripped[3:])}</h3>')
-            elif stripped.startswith('- '):
-                # bullet item
-                if not list_open:
-                    html_parts.append('<ul>')
-                    list_open = True
-                item = stripped[2:]
-                # convert **bold** to <strong>
-                item = html.escape(item)
-                item = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', item)
-                html_parts.append(f'<li>{item}</li>')
-            elif stripped:
-                close_list()
-                txt = html.escape(stripped)
-                txt = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', txt)
-                html_parts.append(f'<p>{txt}</p>')
-        close_list()
-        return '\n'.join(html_parts)
 
-    def send_css(self):
-        """Send CSS file or inline default"""
-        if os.path.exists('style.css'):
-            self.send_response(200)
-            self.send_header('Content-type', 'text/css; charset=utf-8')
-            self.end_headers()
-            with open('style.css', 'rb') as f:
-                self.wfile.write(f.read())
-        else:
-            self.send_response(200)
-            self.send_header('Content-type', 'text/css; charset=utf-8')
-            self.end_headers()
-            css = self.get_default_css()
-            self.wfile.write(css.encode('utf-8'))
+EDITOR_TEMPLATE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Troubleshooting Editor</title>
+<link rel="stylesheet" href="/style.css">
+<style>
+.editor-container {{ max-width: 900px; margin: 0 auto; padding: 1em; }}
+.editor-form {{ background: white; padding: 1.5em; border-radius: 8px; margin-bottom: 2em; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
+.form-group {{ margin: 1.2em 0; }}
+label {{ display: block; font-weight: 600; margin-bottom: 0.5em; color: #333; }}
+input[type="text"], textarea, select {{ 
+    width: 100%; padding: 0.75em; border: 1px solid #ddd; 
+    border-radius: 4px; font-family: monospace; font-size: 1em;
+    box-sizing: border-box;
+}}
+input:focus, textarea:focus {{ outline: none; border-color: #0066cc; box-shadow: 0 0 0 3px rgba(0,102,204,0.1); }}
+textarea {{ min-height: 200px; white-space: pre; }}
+button {{ 
+    background: #0066cc; color: white; padding: 0.8em 1.5em; 
+    border: none; border-radius: 4px; cursor: pointer; font-size: 1em; font-weight: 600;
+}}
+button:hover {{ background: #0052a3; }}
+button:active {{ transform: scale(0.98); }}
+.editor-section h2 {{ color: #333; margin-top: 2em; margin-bottom: 1em; }}
+</style>
+</head>
+<body>
+<div class="editor-container">
+    <header class="header">
+        <h1>📝 Troubleshooting Editor</h1>
+    </header>
+    
+    <p><a href="/">← Back to troubleshooting guide</a></p>
+    
+    <div class="editor-form">
+        <h2>Add New Application Section</h2>
+        <form method="post" action="/editor">
+            <div class="form-group">
+                <label for="appName">Application Name:</label>
+                <input type="text" id="appName" name="appName" placeholder="e.g. HP Printer Errors" required>
+            </div>
+            
+            <div class="form-group">
+                <label for="appSteps">Content:</label>
+                <textarea id="appSteps" name="appSteps" placeholder="## Category Name&#10;- **Error Code**: Description and solution" required></textarea>
+            </div>
+            
+            <button type="submit">Add Application</button>
+        </form>
+    </div>
+    
+    <div class="editor-section">
+        <h2>Edit Full Content</h2>
+        <form method="post" action="/editor">
+            <div class="form-group">
+                <textarea id="fullContent" name="fullContent"></textarea>
+            </div>
+            <button type="submit" name="action" value="save_full">Save Full Content</button>
+        </form>
+    </div>
+</div>
 
-    def get_default_css(self):
-        """Default mobile-first CSS"""
-        return """/* Mobile-first responsive troubleshooting guide */
+<script>
+fetch('{text_file}')
+    .then(r => r.text())
+    .then(text => {{
+        document.getElementById('fullContent').value = text;
+    }})
+    .catch(err => console.log('Could not load file'));
+</script>
+</body>
+</html>"""
+
+# default mobile-first CSS, served when no style.css is present
+_DEFAULT_CSS = """/* Mobile-first responsive troubleshooting guide */
 * {
     margin: 0;
     padding: 0;
@@ -881,48 +1183,34 @@ footer a:hover {
 }
 """
 
-    def do_POST(self):
-        """Handle POST requests"""
-        from urllib.parse import urlparse
-        parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        
-        if path == "/editor":
-            try:
-                content_length = int(self.headers.get('Content-Length', 0))
-                body = self.rfile.read(content_length).decode('utf-8')
-                params = urllib.parse.parse_qs(body)
-                
-                if 'action' in params and params['action'][0] == 'save_full':
-                    full_content = params.get('fullContent', [''])[0]
-                    with open(TEXT_FILE, 'w', encoding='utf-8') as f:
-                        f.write(full_content)
-                    redirect_url = "/?msg=Content saved successfully"
-                else:
-                    app_name = params.get('appName', [''])[0].strip()
-                    app_steps = params.get('appSteps', [''])[0].strip()
-                    
-                    if app_name:
-                        with open(TEXT_FILE, 'a', encoding='utf-8') as f:
-                            f.write(f"\n\n# {app_name}\n\n{app_steps}\n")
-                        redirect_url = f"/?msg=Added: {urllib.parse.quote(app_name)}"
-                    else:
-                        redirect_url = "/?msg=Application name required"
-                
-                self.send_response(303)
-                self.send_header('Location', redirect_url)
-                self.end_headers()
-            except Exception as e:
-                self.send_response(500)
-                self.send_header("Content-type", "text/plain")
-                self.end_headers()
-                self.wfile.write(f"Error: {str(e)}".encode('utf-8'))
-        else:
-            self.send_error(405)
+# encoded once at import; these never change while the server runs
+DEFAULT_CSS_BYTES = _DEFAULT_CSS.encode('utf-8')
+DEFAULT_CSS_ETAG = '"css-%08x"' % zlib.crc32(DEFAULT_CSS_BYTES)
+EDITOR_PAGE_BYTES = EDITOR_TEMPLATE.format(text_file=TEXT_FILE).encode('utf-8')
+
+def _template_literals(template, fields):
+    """Encoded literal text of template around its replacement fields, in order."""
+    literals, current, seen = [], [], []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        # escaped braces come back as extra field-less chunks; merge them
+        current.append(literal)
+        if field is not None:
+            literals.append(''.join(current).encode('utf-8'))
+            current = []
+            seen.append(field)
+    if seen != list(fields):
+        raise ValueError(f"template fields {seen} != {list(fields)}")
+    literals.append(''.join(current).encode('utf-8'))
+    return literals
+
+# static parts of MAIN_TEMPLATE, written around the per-request fragments
+(PAGE_HEAD_BYTES, PAGE_ALERT_BYTES, PAGE_SELECT_BYTES,
+ PAGE_MIDDLE_BYTES, PAGE_TAIL_BYTES) = _template_literals(
+    MAIN_TEMPLATE, ('last_updated', 'success_msg', 'select_html', 'sections_html'))
 
 def run():
     server_address = ('', PORT)
-    httpd = HTTPServer(server_address, TroubleshootHandler)
+    httpd = ThreadingHTTPServer(server_address, TroubleshootHandler)
     print(f"🚀 Server running on http://localhost:{PORT}/")
     print(f"📝 Editor: http://localhost:{PORT}/editor")
     print(f"Press Ctrl+C to stop")